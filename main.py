@@ -1,10 +1,29 @@
 import asyncio
+import logging
+import os
 import websockets
-import json
+import orjson
+
+try:
+    import uvloop
+except ImportError:
+    # uvloop isn't available on Windows, fall back to the stock event loop
+    uvloop = None
 
 URL = "wss://vega-apac.optibook.net/ws/e65ed16e-1042-4aac-8327-e6f972d120d5"
 PLAYER_ID = "50cc97f7-e061-519e-862d-25c882cab50b"
 
+log = logging.getLogger(__name__)
+
+# LOG_LEVEL is matched case-insensitively; anything unrecognised means WARNING
+def log_level_from_env():
+    level = getattr(logging, os.environ.get("LOG_LEVEL", "WARNING").strip().upper(), None)
+    return level if isinstance(level, int) else logging.WARNING
+
+# orjson is much faster than stdlib json and encodes straight to bytes
+json_loads = orjson.loads
+json_dumps = orjson.dumps
+
 connection_message = {
     "event": "connection",
     "player_id": "",
@@ -29,103 +48,117 @@ skip_message = {
     "data": {}
 }
 
+# Control messages never change, so encode them once up front
+CONNECTION_BYTES = json_dumps(connection_message)
+START_BYTES = json_dumps(start_message)
+SKIP_BYTES = json_dumps(skip_message)
+
+# Only the volume varies between trades, so pre-encode every volume we can send
+TRADE_MSGS = {
+    volume: json_dumps({"event": "trade", "player_id": PLAYER_ID, "data": {"volume": volume}})
+    for volume in range(-3, 4)
+}
+
 # This function will handle the puzzle impact and adjust trading accordingly
 def handle_puzzle_impact(puzzle_data):
     impact = puzzle_data.get("impact", 0)
     if impact > 0:
-        print(f"The stock will increase by ${impact}.")
+        log.debug("The stock will increase by $%s.", impact)
         return impact  # Indicating stock will increase (buy)
     elif impact < 0:
-        print(f"The stock will decrease by ${abs(impact)}.")
+        log.debug("The stock will decrease by $%s.", abs(impact))
         return impact  # Indicating stock will decrease (sell)
     return 0  # No trade if no clear impact
 
+# Event handlers, dispatched on the message's "event" field. A handler returns
+# True when the game is over and the receive loop should stop
+async def on_connection(websocket, data):
+    if data.get("player_id") == PLAYER_ID:
+        log.info("Connection established, sending start event...")
+        await websocket.send(START_BYTES, text=True)
+        log.debug("Sent start message")
+
+async def on_state(websocket, data):
+    forecast = data.get("price_forecast", 0)
+    position = data.get("position", 0)
+    position_limit = data.get("position_limit", 3)
+
+    if forecast > 0 and position < position_limit:
+        trade_volume = 3
+    elif forecast < 0 and position > -position_limit:
+        trade_volume = -3
+    else:
+        trade_volume = 0
+
+    if trade_volume != 0:
+        await websocket.send(TRADE_MSGS[trade_volume], text=True)
+        log.debug("Sent trade: %s %d", "BUY" if trade_volume > 0 else "SELL", abs(trade_volume))
+
+async def on_end(websocket, data):
+    log.info("Game over!")
+    return True  # Exit the loop when the game ends
+
+# Handling the puzzle event
+async def on_puzzle(websocket, data):
+    puzzle_impact = handle_puzzle_impact(data)
+
+    # If puzzle impact is positive (stock increases), buy more stock
+    if puzzle_impact > 0:
+        await websocket.send(TRADE_MSGS[3], text=True)
+        log.debug("Sent trade: BUY 3")
+
+    # If puzzle impact is negative (stock decreases), sell stock
+    elif puzzle_impact < 0:
+        await websocket.send(TRADE_MSGS[-3], text=True)
+        log.debug("Sent trade: SELL 3")
+
+    # After the trade, send the skip message to move to the next puzzle/event
+    await websocket.send(SKIP_BYTES, text=True)
+    log.debug("Sent skip message")
+
+HANDLERS = {
+    "connection": on_connection,
+    "state": on_state,
+    "end": on_end,
+    "puzzle": on_puzzle
+}
+
 async def connect():
-    async with websockets.connect(URL) as websocket:
-        print("Connected to WebSocket")
-        await websocket.send(json.dumps(connection_message))
-        print("Sent connection message")
+    # Keepalive pings detect a dead connection, so recv() needs no timeout. Our
+    # messages are tiny JSON, so permessage-deflate would only cost CPU
+    async with websockets.connect(URL, ping_interval=20, ping_timeout=10,
+                                  compression=None, max_size=2**20) as websocket:
+        log.info("Connected to WebSocket")
+        await websocket.send(CONNECTION_BYTES, text=True)
+        log.debug("Sent connection message")
 
         while True:
             try:
-                response = await asyncio.wait_for(websocket.recv(), timeout=5)
-                print(f"Received: {response}")
-                response_data = json.loads(response)
-
-                if response_data.get("event") == "connection" and "data" in response_data:
-                    if response_data["data"].get("player_id") == PLAYER_ID:
-                        print("Connection established, sending start event...")
-                        await websocket.send(json.dumps(start_message))
-                        print("Sent start message")
-
-                elif response_data.get("event") == "state" and "data" in response_data:
-                    forecast = response_data["data"].get("price_forecast", 0)
-                    position = response_data["data"].get("position", 0)
-                    position_limit = response_data["data"].get("position_limit", 3)
-
-                    if forecast > 0 and position < position_limit:
-                        trade_volume = 3
-                    elif forecast < 0 and position > -position_limit:
-                        trade_volume = -3
-                    else:
-                        trade_volume = 0
-
-                    if trade_volume != 0:
-                        trade_message = {
-                            "event": "trade",
-                            "player_id": PLAYER_ID,
-                            "data": {
-                                "volume": trade_volume
-                            }
-                        }
-                        await websocket.send(json.dumps(trade_message))
-                        print(f"Sent trade: {'BUY' if trade_volume > 0 else 'SELL'} {abs(trade_volume)}")
-                elif response_data.get("event") == "end" and "data" in response_data:
-                    print("Game over!")
-                    break  # Exit the loop when the game ends
-
-                # Handling the puzzle event
-                elif response_data.get("event") == "puzzle" and "data" in response_data:
-                    puzzle_data = response_data["data"]
-                    puzzle_impact = handle_puzzle_impact(puzzle_data)
-
-                    # If puzzle impact is positive (stock increases), buy more stock
-                    if puzzle_impact > 0:
-                        trade_message = {
-                            "event": "trade",
-                            "player_id": PLAYER_ID,
-                            "data": {
-                                "volume": 3  # Buy more stock
-                            }
-                        }
-                        await websocket.send(json.dumps(trade_message))
-                        print("Sent trade: BUY 3")
-
-                    # If puzzle impact is negative (stock decreases), sell stock
-                    elif puzzle_impact < 0:
-                        trade_message = {
-                            "event": "trade",
-                            "player_id": PLAYER_ID,
-                            "data": {
-                                "volume": -3  # Sell stock
-                            }
-                        }
-                        await websocket.send(json.dumps(trade_message))
-                        print("Sent trade: SELL 3")
-
-                    # After the trade, send the skip message to move to the next puzzle/event
-                    await websocket.send(json.dumps(skip_message))
-                    print("Sent skip message")
-
-            except asyncio.TimeoutError:
-                continue
+                # Take the raw frame payload: orjson parses bytes and rejects bad UTF-8 itself
+                response = await websocket.recv(decode=False)
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("Received: %s", response.decode(errors="replace"))
+                response_data = json_loads(response)
+
+                handler = HANDLERS.get(response_data.get("event"))
+                data = response_data.get("data")
+                if handler is not None and data is not None:
+                    if await handler(websocket, data):
+                        break
+
             except Exception as e:
-                print(f"Error: {e}")
+                log.error("Error: %s", e)
                 break
 
 
 def main():
-    asyncio.run(connect())
+    # Quiet by default; set LOG_LEVEL=DEBUG to see every message. Only the bot's
+    # own logger follows LOG_LEVEL, websockets' per-frame logging stays at WARNING
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    log.setLevel(log_level_from_env())
+    # uvloop's libuv-based loop is considerably cheaper per await than asyncio's
+    run = uvloop.run if uvloop is not None else asyncio.run
+    run(connect())
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,30 @@
 import asyncio
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import websockets
-import json
+import orjson
 import random
 import numpy as np
-from collections import deque
-import time
-import statistics
+from math import tanh
+from collections import deque, namedtuple
+from operator import itemgetter
+
+try:
+    import uvloop
+except ImportError:
+    # uvloop isn't available on Windows, fall back to the stock event loop
+    uvloop = None
+
+try:
+    from numba import njit
+except ImportError:
+    # Without numba the decorated functions simply run as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
 
 # Configuration
 URL = "wss://vega-apac.optibook.net/ws/e65ed16e-1042-4aac-8327-e6f972d120d5"
@@ -13,6 +32,17 @@ PLAYER_ID = "50cc97f7-e061-519e-862d-25c882cab50b"
 NUM_CONNECTIONS = 20  # Number of parallel connections to maintain
 HISTORY_SIZE = 20  # Size of history window for strategy optimization
 
+log = logging.getLogger(__name__)
+
+# LOG_LEVEL is matched case-insensitively; anything unrecognised means WARNING
+def log_level_from_env():
+    level = getattr(logging, os.environ.get("LOG_LEVEL", "WARNING").strip().upper(), None)
+    return level if isinstance(level, int) else logging.WARNING
+
+# orjson is much faster than stdlib json and encodes straight to bytes
+json_loads = orjson.loads
+json_dumps = orjson.dumps
+
 connection_message = {
     "event": "connection",
     "player_id": "",
@@ -37,50 +67,161 @@ skip_message = {
     "data": {}
 }
 
+# Control messages never change, so encode them once up front
+START_BYTES = json_dumps(start_message)
+SKIP_BYTES = json_dumps(skip_message)
+
+# Each connection only differs by its alias, so encode every connection's
+# message once at import and reconnects just look theirs up
+CONN_MSGS = {
+    conn_id: json_dumps({
+        **connection_message,
+        "data": {**connection_message["data"], "alias": f"Aegizz-{conn_id}"}
+    })
+    for conn_id in range(NUM_CONNECTIONS)
+}
+
+# Only the volume varies between trades, so pre-encode the volumes we normally send
+# (aggressive_factor tops out at 2.0, so |volume| <= 6 with the default position limit)
+TRADE_MSGS = {
+    volume: json_dumps({"event": "trade", "player_id": PLAYER_ID, "data": {"volume": volume}})
+    for volume in range(-6, 7)
+}
+
+def trade_bytes(volume):
+    msg = TRADE_MSGS.get(volume)
+    if msg is None:
+        # Larger position limits can still produce volumes outside the table
+        msg = json_dumps({"event": "trade", "player_id": PLAYER_ID, "data": {"volume": volume}})
+    return msg
+
+# Strategy parameters are immutable and replaced wholesale by optimize_strategy,
+# so connections can read them without any locking
+StrategyParams = namedtuple("StrategyParams", [
+    "momentum_weight",
+    "forecast_weight",
+    "strong_momentum_threshold",
+    "medium_momentum_threshold",
+    "aggressive_factor"
+])
+
 # Shared state for all connections
 class SharedState:
     def __init__(self):
-        self.strategy_params = {
-            "momentum_weight": 0.6,
-            "forecast_weight": 0.4,
-            "strong_momentum_threshold": 10,
-            "medium_momentum_threshold": 5,
-            "aggressive_factor": 1.5
-        }
-        self.trade_history = deque(maxlen=HISTORY_SIZE)
-        self.performance_history = deque(maxlen=HISTORY_SIZE)
-        self.lock = asyncio.Lock()
-        self.last_optimization = time.time()
+        self.strategy_params = StrategyParams(
+            momentum_weight=0.6,
+            forecast_weight=0.4,
+            strong_momentum_threshold=10,
+            medium_momentum_threshold=5,
+            aggressive_factor=1.5
+        )
         self.optimization_interval = 30  # Seconds between strategy optimizations
         
+        # Performance history as a ring buffer of one array per field, so the
+        # optimizer can work on whole columns at once
+        self.pnl_change_arr = np.zeros(HISTORY_SIZE)
+        self.momentum_arr = np.zeros(HISTORY_SIZE)
+        self.forecast_arr = np.zeros(HISTORY_SIZE)
+        self.trade_vol_arr = np.zeros(HISTORY_SIZE)
+        self.cursor = 0  # Next slot to write
+        self.count = 0  # Number of filled slots
+        
         # For each connection, track its performance
         self.connection_performance = {}
+    
+    # Record a performance entry, overwriting the oldest once the window is full
+    def add_performance(self, momentum, forecast, trade_volume, pnl_change):
+        i = self.cursor
+        self.pnl_change_arr[i] = pnl_change
+        self.momentum_arr[i] = momentum
+        self.forecast_arr[i] = forecast
+        self.trade_vol_arr[i] = trade_volume
+        self.cursor = (i + 1) % HISTORY_SIZE
+        self.count = min(self.count + 1, HISTORY_SIZE)
 
 shared_state = SharedState()
 
+# Per-connection outgoing queue drained by a single writer task, so handlers
+# never wait on a send before going back to recv
+class ConnectionWriter:
+    def __init__(self, conn_id, websocket):
+        self.conn_id = conn_id
+        self.websocket = websocket
+        self.out_queue = deque()
+        self.writer_wakeup = asyncio.get_running_loop().create_future()
+        self.task = None
+        self.close_task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+        self.task.add_done_callback(self._on_done)
+
+    # Graceful shutdown: the writer exits once everything queued before the
+    # sentinel is on the wire, so nothing the handlers sent is dropped
+    async def finish(self):
+        self.send(None)
+        try:
+            await self.task
+        except Exception:
+            pass  # Already logged by _on_done
+
+    # Error shutdown: the connection is going away, drop whatever is queued
+    async def stop(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            pass  # Already logged by _on_done
+
+    def _on_done(self, task):
+        if task.cancelled() or task.exception() is None:
+            return
+        log.warning("Connection %d: Writer failed: %s", self.conn_id, task.exception())
+        # Close the socket so recv() fails and the reconnect loop takes over,
+        # rather than queuing messages nobody will send
+        self.close_task = asyncio.ensure_future(self.websocket.close())
+
+    def send(self, msg):
+        self.out_queue.append(msg)
+        if not self.writer_wakeup.done():
+            self.writer_wakeup.set_result(None)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.writer_wakeup
+            self.writer_wakeup = loop.create_future()
+            # Sends stay sequential so the server sees e.g. trade before skip
+            while self.out_queue:
+                msg = self.out_queue.popleft()
+                if msg is None:
+                    return
+                await self.websocket.send(msg, text=True)
+
 # Handle puzzle impact
 def handle_puzzle_impact(puzzle_data):
     impact = puzzle_data.get("impact", 0)
     if impact > 0:
-        print(f"The stock will increase by ${impact}.")
+        log.debug("The stock will increase by $%s.", impact)
         return impact  # Indicating stock will increase (buy)
     elif impact < 0:
-        print(f"The stock will decrease by ${abs(impact)}.")
+        log.debug("The stock will decrease by $%s.", abs(impact))
         return impact  # Indicating stock will decrease (sell)
     return 0  # No trade if no clear impact
 
 # Dynamic trade volume determination with adaptive parameters
-def determine_trade_volume(forecast, momentum, position, position_limit, conn_id, params):
-    # Extract parameters
-    momentum_weight = params["momentum_weight"]
-    forecast_weight = params["forecast_weight"]
-    strong_momentum_threshold = params["strong_momentum_threshold"]
-    medium_momentum_threshold = params["medium_momentum_threshold"]
-    aggressive_factor = params["aggressive_factor"]
-    
+# Compiled to native code with numba, so it only takes plain numbers. The explicit
+# signature compiles it once at import instead of mid-game on the event loop, and
+# callers coerce their arguments to match it
+@njit("int64(float64, float64, int64, int64, float64, float64, float64)",
+      cache=True, fastmath=True)
+def determine_trade_volume(forecast, momentum, position, position_limit,
+                           momentum_weight, forecast_weight, aggressive_factor):
     # Calculate weighted signal
-    momentum_signal = np.tanh(momentum / 10)  # Normalize momentum
-    forecast_signal = np.tanh(forecast * 2)    # Normalize forecast
+    momentum_signal = tanh(momentum / 10.0)  # Normalize momentum
+    forecast_signal = tanh(forecast * 2.0)    # Normalize forecast
     
     # Weighted combination of signals
     combined_signal = (momentum_signal * momentum_weight) + (forecast_signal * forecast_weight)
@@ -88,88 +229,191 @@ def determine_trade_volume(forecast, momentum, position, position_limit, conn_id
     # Scale signal to a trading volume between -3 and 3
     raw_volume = combined_signal * 3 * aggressive_factor
     
-    # Apply position limits
-    if raw_volume > 0:
-        max_buy = position_limit - position
-        trade_volume = min(max(0, round(raw_volume)), max_buy)
-    elif raw_volume < 0:
-        max_sell = position + position_limit
-        trade_volume = max(-max_sell, min(0, round(raw_volume)))
-    else:
-        trade_volume = 0
+    # Apply position limits by clamping to the room left on each side,
+    # without branching on the signal
+    max_buy = max(0, position_limit - position)
+    max_sell = max(0, position + position_limit)
+    return max(-max_sell, min(max_buy, round(raw_volume)))
+
+# Work out new strategy parameters from a snapshot of the performance history.
+# Pure computation on its own copies, so it can run off the event loop thread
+def _compute_new_params(params, pnl_change, trade_volume, momentum, forecast):
+    # Calculate average profit per trade
+    avg_profit = pnl_change.mean()
     
-    # Record for strategy optimization
-    signal_data = {
-        "conn_id": conn_id,
-        "timestamp": time.time(),
-        "momentum": momentum,
-        "forecast": forecast,
-        "combined_signal": combined_signal,
-        "trade_volume": trade_volume,
-        "position": position
-    }
-    shared_state.trade_history.append(signal_data)
+    # If our strategy is working well, be more aggressive
+    if avg_profit > 5:
+        # Successful strategy - adjust weights to favor what's working. Each profitable
+        # trade scores 1 for its stronger signal and 0.5 for the weaker one
+        wins_mask = (pnl_change > 0) & (trade_volume != 0)
+        wins = int(wins_mask.sum())
+        
+        # If we have correlation data, adjust weights
+        if wins:
+            momentum_wins = int((np.abs(momentum[wins_mask]) > np.abs(forecast[wins_mask])).sum())
+            forecast_wins = wins - momentum_wins
+            avg_momentum_corr = (momentum_wins + 0.5 * forecast_wins) / wins
+            avg_forecast_corr = (0.5 * momentum_wins + forecast_wins) / wins
+            total = avg_momentum_corr + avg_forecast_corr
+            
+            # Update weights based on correlation
+            return params._replace(
+                momentum_weight=avg_momentum_corr / total,
+                forecast_weight=avg_forecast_corr / total,
+                aggressive_factor=min(2.0, params.aggressive_factor + 0.1)
+            )
+    elif avg_profit < -5:
+        # Strategy is losing money - be more conservative and reset weights
+        return params._replace(
+            momentum_weight=0.5,
+            forecast_weight=0.5,
+            aggressive_factor=max(1.0, params.aggressive_factor - 0.2)
+        )
     
-    return trade_volume
+    return params
 
 # Adjust strategy parameters based on performance
 async def optimize_strategy():
-    async with shared_state.lock:
-        # Only optimize if enough time has passed and we have data
-        current_time = time.time()
-        if (current_time - shared_state.last_optimization < shared_state.optimization_interval or
-                len(shared_state.performance_history) < 5):
-            return
+    # Only optimize once we have enough data
+    count = shared_state.count
+    if count < 5:
+        return
+    
+    # Copy the filled slots so connections can keep recording while we compute
+    new_params = await asyncio.get_running_loop().run_in_executor(
+        None, _compute_new_params, shared_state.strategy_params,
+        shared_state.pnl_change_arr[:count].copy(),
+        shared_state.trade_vol_arr[:count].copy(),
+        shared_state.momentum_arr[:count].copy(),
+        shared_state.forecast_arr[:count].copy()
+    )
+    
+    # Publish the new parameters in one assignment
+    shared_state.strategy_params = new_params
+    log.info("Optimized strategy parameters: %s", shared_state.strategy_params)
+
+# Pulls every state field on_state needs in one C-level call
+_GET_STATE = itemgetter("price_forecast", "momentum", "position", "position_limit", "price", "pnl")
+
+# Event handlers, dispatched on the message's "event" field. A handler returns
+# True when the game is over and the connection should be recycled
+async def on_connection(conn_id, writer, data):
+    if data.get("player_id") == PLAYER_ID:
+        log.info("Connection %d: Established, sending start event...", conn_id)
+        writer.send(START_BYTES)
+
+async def on_state(conn_id, writer, data):
+    try:
+        forecast, momentum, position, position_limit, current_price, current_pnl = _GET_STATE(data)
+    except KeyError:
+        # Fall back to defaults if the server leaves a field out
+        forecast = data.get("price_forecast", 0)
+        momentum = data.get("momentum", 0)
+        position = data.get("position", 0)
+        position_limit = data.get("position_limit", 3)
+        current_price = data.get("price", 0)
+        current_pnl = data.get("pnl", 0)
+    
+    # Get current strategy parameters (an immutable snapshot, no lock needed)
+    params = shared_state.strategy_params
+    
+    # Calculate trade volume
+    trade_volume = determine_trade_volume(
+        float(forecast), float(momentum), int(position), int(position_limit),
+        float(params.momentum_weight), float(params.forecast_weight),
+        float(params.aggressive_factor)
+    )
+    
+    # Track PnL changes
+    performance = shared_state.connection_performance[conn_id]
+    pnl_change = current_pnl - performance["last_pnl"]
+    performance["last_pnl"] = current_pnl
+    
+    # Record performance data for optimization
+    if performance["trades_made"] > 0:
+        shared_state.add_performance(momentum, forecast, trade_volume, pnl_change)
+    
+    log.debug("Connection %d: Price=$%s, Forecast=%.2f, Momentum=%.2f, Position=%s/%s, PnL=$%s",
+              conn_id, current_price, forecast, momentum, position, position_limit, current_pnl)
+    
+    # Execute trade if needed
+    if trade_volume != 0:
+        writer.send(trade_bytes(trade_volume))
+        log.debug("Connection %d: Sent trade: %s %d",
+                  conn_id, "BUY" if trade_volume > 0 else "SELL", abs(trade_volume))
         
-        shared_state.last_optimization = current_time
+        # Update trade statistics
+        performance["trades_made"] += 1
+
+async def on_finish(conn_id, writer, data):
+    log.info("Connection %d: Game over! Final PnL: $%s", conn_id, data.get("pnl", 0))
+    log.info("Connection %d: Will reconnect shortly...", conn_id)
+    return True
+
+async def on_puzzle(conn_id, writer, data):
+    puzzle_impact = handle_puzzle_impact(data)
+    
+    # Trade based on puzzle impact
+    if puzzle_impact != 0:
+        writer.send(TRADE_MSGS[3 if puzzle_impact > 0 else -3])
+        log.debug("Connection %d: Sent puzzle trade: %s 3",
+                  conn_id, "BUY" if puzzle_impact > 0 else "SELL")
+    
+    # Skip to next stage
+    writer.send(SKIP_BYTES)
+    log.debug("Connection %d: Sent skip message", conn_id)
+
+HANDLERS = {
+    "connection": on_connection,
+    "state": on_state,
+    "finish": on_finish,
+    "puzzle": on_puzzle
+}
+
+# Run one session on a connection, until the game finishes or the connection drops
+async def _run_once(conn_id):
+    # Keepalive pings detect a dead connection, so recv() needs no timeout. Our
+    # messages are tiny JSON, so permessage-deflate would only cost CPU
+    async with websockets.connect(URL, ping_interval=20, ping_timeout=10,
+                                  compression=None, max_size=2**20) as websocket:
+        log.info("Connection %d: Connected to WebSocket", conn_id)
         
-        # If we have performance data, use it to optimize
-        if shared_state.performance_history:
-            # Extract the most recent PnL changes
-            recent_performances = list(shared_state.performance_history)
-            
-            # Calculate average profit per trade
-            avg_profit = statistics.mean([p.get("pnl_change", 0) for p in recent_performances])
-            
-            # If our strategy is working well, be more aggressive
-            if avg_profit > 5:
-                # Successful strategy - adjust weights to favor what's working
-                momentum_correlations = []
-                forecast_correlations = []
-                
-                for p in recent_performances:
-                    if p.get("pnl_change", 0) > 0 and p.get("trade_volume", 0) != 0:
-                        # This was a profitable trade - look at what signals were stronger
-                        if abs(p.get("momentum", 0)) > abs(p.get("forecast", 0)):
-                            momentum_correlations.append(1)
-                            forecast_correlations.append(0.5)
-                        else:
-                            momentum_correlations.append(0.5)
-                            forecast_correlations.append(1)
+        writer = ConnectionWriter(conn_id, websocket)
+        writer.start()
+        try:
+            writer.send(CONN_MSGS[conn_id])
+            log.debug("Connection %d: Sent connection message", conn_id)
+
+            while True:
+                try:
+                    # Take the raw frame payload: orjson parses bytes and rejects bad UTF-8 itself
+                    response = await websocket.recv(decode=False)
+                    response_data = json_loads(response)
                 
-                # If we have correlation data, adjust weights
-                if momentum_correlations and forecast_correlations:
-                    avg_momentum_corr = statistics.mean(momentum_correlations)
-                    avg_forecast_corr = statistics.mean(forecast_correlations)
-                    total = avg_momentum_corr + avg_forecast_corr
-                    
-                    # Update weights based on correlation
-                    shared_state.strategy_params["momentum_weight"] = avg_momentum_corr / total
-                    shared_state.strategy_params["forecast_weight"] = avg_forecast_corr / total
-                    shared_state.strategy_params["aggressive_factor"] = min(2.0, 
-                                                                        shared_state.strategy_params["aggressive_factor"] + 0.1)
-            elif avg_profit < -5:
-                # Strategy is losing money - be more conservative and reset weights
-                shared_state.strategy_params["momentum_weight"] = 0.5
-                shared_state.strategy_params["forecast_weight"] = 0.5
-                shared_state.strategy_params["aggressive_factor"] = max(1.0, 
-                                                                    shared_state.strategy_params["aggressive_factor"] - 0.2)
+                    handler = HANDLERS.get(response_data.get("event"))
+                    data = response_data.get("data")
+                    if handler is not None and data is not None:
+                        # Leave the loop on game end so the connection is recycled
+                        if await handler(conn_id, writer, data):
+                            break
             
-            print(f"Optimized strategy parameters: {shared_state.strategy_params}")
+                except orjson.JSONDecodeError as e:
+                    log.warning("Connection %d: JSON decode error: %s", conn_id, e)
+                    continue
+                except Exception as e:
+                    log.warning("Connection %d: Error in message handling: %s", conn_id, e)
+                    # Let the outer exception handler deal with reconnection
+                    raise
+        except BaseException:
+            await writer.stop()
+            raise
+        
+        # Game over: let the last trades and skips reach the server before closing
+        await writer.finish()
 
-# Handle a single connection
+# Handle a single connection, reconnecting in place whenever a session ends
 async def handle_connection(conn_id):
-    print(f"Starting connection {conn_id}")
+    log.info("Starting connection %d", conn_id)
     
     # Initialize this connection's performance tracking
     if conn_id not in shared_state.connection_performance:
@@ -179,139 +423,27 @@ async def handle_connection(conn_id):
             "successful_trades": 0
         }
     
-    try:
-        async with websockets.connect(URL) as websocket:
-            print(f"Connection {conn_id}: Connected to WebSocket")
-            
-            # Customize the connection message for this connection
-            conn_message = json.loads(json.dumps(connection_message))
-            conn_message["data"]["alias"] = f"Aegizz-{conn_id}"
-            
-            await websocket.send(json.dumps(conn_message))
-            print(f"Connection {conn_id}: Sent connection message")
+    while True:
+        try:
+            await _run_once(conn_id)
+        except Exception as e:
+            log.warning("Connection %d: Connection error: %s", conn_id, e)
+        
+        log.info("Connection %d: Closed, preparing to reconnect", conn_id)
+        
+        # Wait a few seconds before reconnecting
+        await asyncio.sleep(random.uniform(1, 3))
 
-            while True:
-                try:
-                    response = await asyncio.wait_for(websocket.recv(), timeout=5)
-                    response_data = json.loads(response)
-                    
-                    # Handle connection establishment
-                    if response_data.get("event") == "connection" and "data" in response_data:
-                        if response_data["data"].get("player_id") == PLAYER_ID:
-                            print(f"Connection {conn_id}: Established, sending start event...")
-                            await websocket.send(json.dumps(start_message))
-                    
-                    # Handle state updates
-                    elif response_data.get("event") == "state" and "data" in response_data:
-                        state_data = response_data["data"]
-                        forecast = state_data.get("price_forecast", 0)
-                        momentum = state_data.get("momentum", 0)
-                        position = state_data.get("position", 0)
-                        position_limit = state_data.get("position_limit", 3)
-                        current_price = state_data.get("price", 0)
-                        current_pnl = state_data.get("pnl", 0)
-                        
-                        # Get current strategy parameters
-                        async with shared_state.lock:
-                            params = dict(shared_state.strategy_params)
-                        
-                        # Calculate trade volume
-                        trade_volume = determine_trade_volume(
-                            forecast, momentum, position, position_limit, conn_id, params
-                        )
-                        
-                        # Track PnL changes
-                        last_pnl = shared_state.connection_performance[conn_id]["last_pnl"]
-                        pnl_change = current_pnl - last_pnl
-                        shared_state.connection_performance[conn_id]["last_pnl"] = current_pnl
-                        
-                        # Record performance data for optimization
-                        if shared_state.connection_performance[conn_id]["trades_made"] > 0:
-                            perf_data = {
-                                "conn_id": conn_id,
-                                "timestamp": time.time(),
-                                "momentum": momentum,
-                                "forecast": forecast,
-                                "position": position,
-                                "trade_volume": trade_volume,
-                                "pnl_change": pnl_change,
-                                "price": current_price,
-                                "total_pnl": current_pnl
-                            }
-                            shared_state.performance_history.append(perf_data)
-                        
-                        print(f"Connection {conn_id}: Price=${current_price}, Forecast={forecast:.2f}, "
-                              f"Momentum={momentum:.2f}, Position={position}/{position_limit}, PnL=${current_pnl}")
-                        
-                        # Execute trade if needed
-                        if trade_volume != 0:
-                            trade_message = {
-                                "event": "trade",
-                                "player_id": PLAYER_ID,
-                                "data": {
-                                    "volume": trade_volume
-                                }
-                            }
-                            await websocket.send(json.dumps(trade_message))
-                            print(f"Connection {conn_id}: Sent trade: "
-                                  f"{'BUY' if trade_volume > 0 else 'SELL'} {abs(trade_volume)}")
-                            
-                            # Update trade statistics
-                            shared_state.connection_performance[conn_id]["trades_made"] += 1
-                        
-                        # Update strategy periodically
-                        await optimize_strategy()
-                    
-                    # Handle game end
-                    elif response_data.get("event") == "finish" and "data" in response_data:
-                        final_pnl = response_data["data"].get("pnl", 0)
-                        print(f"Connection {conn_id}: Game over! Final PnL: ${final_pnl}")
-                        print(f"Connection {conn_id}: Will reconnect shortly...")
-                        # Instead of break, we'll raise an exception to ensure we hit the reconnection code
-                        raise asyncio.CancelledError("Game finished, reconnecting...")
-                    
-                    # Handle puzzles
-                    elif response_data.get("event") == "puzzle" and "data" in response_data:
-                        puzzle_data = response_data["data"]
-                        puzzle_impact = handle_puzzle_impact(puzzle_data)
-                        
-                        # Trade based on puzzle impact
-                        if puzzle_impact != 0:
-                            trade_message = {
-                                "event": "trade",
-                                "player_id": PLAYER_ID,
-                                "data": {
-                                    "volume": 3 if puzzle_impact > 0 else -3
-                                }
-                            }
-                            await websocket.send(json.dumps(trade_message))
-                            print(f"Connection {conn_id}: Sent puzzle trade: "
-                                  f"{'BUY' if puzzle_impact > 0 else 'SELL'} 3")
-                        
-                        # Skip to next stage
-                        await websocket.send(json.dumps(skip_message))
-                        print(f"Connection {conn_id}: Sent skip message")
-                
-                except asyncio.TimeoutError:
-                    continue
-                except json.JSONDecodeError as e:
-                    print(f"Connection {conn_id}: JSON decode error: {e}")
-                    continue
-                except Exception as e:
-                    print(f"Connection {conn_id}: Error in message handling: {e}")
-                    # Let the outer exception handler deal with reconnection
-                    raise
-    
-    except Exception as e:
-        print(f"Connection {conn_id}: Connection error: {e}")
-    
-    print(f"Connection {conn_id}: Closed, preparing to reconnect")
-    
-    # Wait a few seconds before reconnecting
-    await asyncio.sleep(random.uniform(1, 3))
-    
-    # Reconnect by creating a new task
-    asyncio.create_task(handle_connection(conn_id))
+# Update the strategy once per interval, however many connections are running
+async def periodic_optimizer():
+    while True:
+        await asyncio.sleep(shared_state.optimization_interval)
+        try:
+            await optimize_strategy()
+        except Exception as e:
+            # A failed run keeps the current parameters; it must not take down
+            # main() and every connection gathered with it
+            log.warning("Strategy optimization failed: %s", e)
 
 async def main():
     # Start multiple connections in parallel
@@ -320,13 +452,38 @@ async def main():
         task = asyncio.create_task(handle_connection(i))
         connection_tasks.append(task)
     
+    connection_tasks.append(asyncio.create_task(periodic_optimizer()))
+    
     # Wait for all connections to complete (this will run indefinitely)
     await asyncio.gather(*connection_tasks)
 
+# Log records are handed to a background thread, so with 20 connections none of
+# them ever blocks on a stdout write. Quiet by default; set LOG_LEVEL=DEBUG for more
+def setup_logging():
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, handler)
+    
+    # Only the bot's own logger follows LOG_LEVEL, websockets' per-frame
+    # logging stays at WARNING on the root logger
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.WARNING)
+    log.setLevel(log_level_from_env())
+    
+    listener.start()
+    return listener
+
 if __name__ == "__main__":
+    listener = setup_logging()
     try:
-        asyncio.run(main())
+        # uvloop's libuv-based loop is considerably cheaper per await than asyncio's
+        run = uvloop.run if uvloop is not None else asyncio.run
+        run(main())
     except KeyboardInterrupt:
-        print("Bot stopped by user")
+        log.warning("Bot stopped by user")
     except Exception as e:
-        print(f"Critical error in main loop: {e}")
\ No newline at end of file
+        log.critical("Critical error in main loop: %s", e)
+    finally:
+        listener.stop()